@@ -10,15 +10,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import copy
 import json
 import os
 import requests
 import re
+import threading
+import time
 
 from bs4 import BeautifulSoup
 from http.cookiejar import LWPCookieJar, Cookie
 
-from .internal import Album, Playlist, Station, Track
+from .internal import hydrate
+from .internal import Album, Artwork, BitrateSelector, Codec, IdentityMap, NullTracer, Playlist, Station, Track
 
 AMAZON_MUSIC_SUBSCRIPTION = 'MUSIC_SUBSCRIPTION'
 AMAZON_PRIME_SUBSCRIPTION = 'PRIME'
@@ -31,6 +36,29 @@ USER_AGENT = 'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:57.0) Gecko/20100101 Fi
 
 REGION_MAP = {'USAmazon': 'NA', 'EUAmazon': 'EU', 'FEAmazon': 'FE'}
 
+# Sessions are refreshed in the background before they are this old (in seconds),
+# or before the first sign-in cookie (identified by these prefixes) expires
+SESSION_MAX_AGE = 6 * 60 * 60
+SESSION_REFRESH_MARGIN = 5 * 60
+SESSION_COOKIE_PREFIXES = ('session-', 'at-', 'sess-at-', 'x-')
+
+# The request session and CSRF token, which are replaced together when refreshed
+_SessionState = collections.namedtuple('_SessionState', ['session', 'csrf', 'created'])
+
+# Attributes of a `Cookie` saved by `AmazonMusic.snapshot` (besides `rest`)
+_COOKIE_FIELDS = ['version', 'name', 'value', 'port', 'port_specified', 'domain', 'domain_specified',
+                  'domain_initial_dot', 'path', 'path_specified', 'secure', 'expires', 'discard', 'comment',
+                  'comment_url']
+
+
+class _MemoryCookieJar(LWPCookieJar):
+    """
+    Cookie jar which is never written to disk, for objects made by `AmazonMusic.from_snapshot`.
+    """
+
+    def save(self, filename=None, ignore_discard=False, ignore_expires=False):
+        pass
+
 
 class AmazonMusic:
     """
@@ -44,7 +72,8 @@ class AmazonMusic:
       >>> amzn = AmazonMusic(credentials = lambda: [input('Email: '), getpass('Amazon password: ')])
     """
 
-    def __init__(self, email=None, password=None, cookie_cache_path=None, prime=True):
+    def __init__(self, email=None, password=None, cookie_cache_path=None, prime=True, codec=None,
+                 tracer=None, identities=None, artwork=None, bitrate=None):
         """
         Constructs and returns an :class:`AmazonMusic <AmazonMusic>` class. This
         will use a cookie jar stored, by default, in the home directory.
@@ -53,28 +82,108 @@ class AmazonMusic:
         :param password: (required) Amazon account password used for the account (not stored on disk).
         :param cookie_cache_path: (optional) File path to be used for the cookie jar.
         :param prime: (optional) Whether or not the user is an Amazon Music Prime member
+        :param codec: (optional) :class:`Codec <Codec>` used for API request and response bodies.
+        :param tracer: (optional) :class:`Tracer <Tracer>` recording spans around each operation.
+        :param identities: (optional) :class:`IdentityMap <IdentityMap>` holding the canonical `Album` and
+                           `Track` objects, e.g. `IdentityMap(strong=1000)` to also keep recent ones alive.
+        :param artwork: (optional) :class:`Artwork <Artwork>` cache used to fetch cover art.
+        :param bitrate: (optional) :class:`BitrateSelector <BitrateSelector>` choosing the stream bitrate,
+                        e.g. `BitrateSelector(max_bitrate='MEDIUM')` to cap it.
         """
+        self._setup(codec, tracer, identities, artwork, bitrate)
 
         if prime:
             self._amazon_subscription = AMAZON_PRIME_SUBSCRIPTION
         else:
             self._amazon_subscription = AMAZON_MUSIC_SUBSCRIPTION
 
+        with self.tracer.span('AmazonMusic.__init__'):
+            self._bootstrap(email, password, cookie_cache_path)
+
+    @classmethod
+    def from_snapshot(cls, snapshot, codec=None, tracer=None, identities=None, artwork=None, bitrate=None):
+        """
+        Constructs an :class:`AmazonMusic <AmazonMusic>` class from the session saved
+        by `snapshot`, without fetching the homepage or signing in. Its cookies are
+        kept in memory only, so many processes can share one snapshot.
+
+        :param snapshot: Session, as returned by `AmazonMusic.snapshot`.
+
+        The other parameters are as for the constructor.
+        """
+        amzn = cls.__new__(cls)
+        amzn._setup(codec, tracer, identities, artwork, bitrate)
+
+        amzn._amazon_subscription = snapshot['subscription']
+        amzn.device_id = snapshot['deviceId']
+        amzn.customer_id = snapshot['customerId']
+        amzn.device_type = snapshot['deviceType']
+        amzn.territory = snapshot['territory']
+        amzn.locale = snapshot['locale']
+        amzn.region = snapshot['region']
+        amzn.url = snapshot['url']
+
+        session = requests.Session()
+        session.cookies = _MemoryCookieJar()
+        for c in snapshot['cookies']:
+            session.cookies.set_cookie(Cookie(rest=c['rest'], **{f: c[f] for f in _COOKIE_FIELDS}))
+
+        amzn._state = _SessionState(session, dict(snapshot['csrf']), snapshot['created'])
+        return amzn
+
+    def snapshot(self):
+        """
+        Return the session (cookies, CSRF token and site configuration) as a
+        JSON-serialisable `dict`, from which `AmazonMusic.from_snapshot` creates
+        an equivalent object without signing in, e.g. in a worker process.
+        """
+        state = self._state
+        return {
+            'cookies': [dict({f: getattr(c, f) for f in _COOKIE_FIELDS}, rest=c._rest) for c in state.session.cookies],
+            'csrf': dict(state.csrf),
+            'created': state.created,
+            'subscription': self._amazon_subscription,
+            'deviceId': self.device_id,
+            'customerId': self.customer_id,
+            'deviceType': self.device_type,
+            'territory': self.territory,
+            'locale': self.locale,
+            'region': self.region,
+            'url': self.url
+        }
+
+    def _setup(self, codec, tracer, identities, artwork, bitrate):
+        """
+        Sets up the parts of the object which do not depend on the session.
+        """
+        self.codec = codec or Codec()
+        self.tracer = tracer or NullTracer()
+        self.identities = identities if identities is not None else IdentityMap()
+        self.artwork = artwork or Artwork(user_agent=USER_AGENT)
+        self.bitrate = bitrate or BitrateSelector()
+        self._cookie_lock = threading.Lock()
+        self._refresher = None
+        self.refresh_error = None
+
+    def _bootstrap(self, email, password, cookie_cache_path):
+        """
+        Loads the cookie jar, signs in if needed and reads the site configuration.
+        """
         # Compute cache path, or use current directory
         current_dir = os.path.dirname(os.path.realpath(__file__))
         _cookie_cache_path = cookie_cache_path or '{}/.amzn.cookies'.format(
             os.environ.get('HOME', os.environ.get('LOCALAPPDATA', current_dir)))
 
         # Create a request session (with cookies)
-        self.session = requests.Session()
-        self.session.cookies = LWPCookieJar(_cookie_cache_path)
+        session = requests.Session()
+        session.cookies = LWPCookieJar(_cookie_cache_path)
 
         # Load cookies from disk
         if os.path.isfile(_cookie_cache_path):
-            self.session.cookies.load()
+            session.cookies.load()
 
         # Check if the Amazon region is already stored in the cache
-        target_region_cookie = next((c for c in self.session.cookies if c.name == COOKIE_AMAZON_TARGET), None)
+        target_region_cookie = next((c for c in session.cookies if c.name == COOKIE_AMAZON_TARGET), None)
 
         # If the target is not available, create one (this will be filled with the proper region)
         if target_region_cookie is None:
@@ -82,16 +191,41 @@ class AmazonMusic:
                             False, True, 2147483647, False, None, None, {})
 
         # Fetch the homepage, authenticate if needed
-        self._email = email
-        self._password = password
-
-        r = self.session.get(
+        r = session.get(
             target_region_cookie.value, headers={'User-Agent': USER_AGENT})
 
         # Save cookies to disk (and ensure permissions are correct)
-        self.session.cookies.save()
+        session.cookies.save()
         os.chmod(_cookie_cache_path, 0o600)
 
+        # The credentials are only held by this closure, so that they may not be accessed later
+        amzn_music_config = self._read_config(session, r, lambda: [email, password])
+
+        self.device_id = amzn_music_config['deviceId']
+        self.customer_id = amzn_music_config['customerId']
+        self.device_type = amzn_music_config['deviceType']
+        self.territory = amzn_music_config['musicTerritory']
+        self.locale = amzn_music_config['i18n']['locale']
+        self.region = REGION_MAP.get(amzn_music_config['realm'],
+                                     amzn_music_config['realm'][:2])
+        self.url = 'https://' + amzn_music_config['serverInfo']['returnUrlServer']
+
+        target_region_cookie.value = self.url
+
+        # Store the target region inside the cookie (and write it to disk)
+        session.cookies.set_cookie(target_region_cookie)
+        session.cookies.save()
+
+        self._state = _SessionState(session, amzn_music_config['CSRFTokenConfig'], time.time())
+
+    def _read_config(self, session, r, credentials):
+        """
+        Reads `appConfig` from the Amazon Music homepage, signing in first if needed.
+
+        :param session: The request session to use.
+        :param r: The response object for the homepage.
+        :param credentials: Function returning `[email, password]`, called if a sign-in is needed.
+        """
         # Zero out the site configuration
         amzn_music_config = None
         while amzn_music_config is None:
@@ -99,7 +233,7 @@ class AmazonMusic:
             while r.history and any(h.status_code == 302
                                     and AMAZON_SIGN_IN_PATH in h.headers['Location']
                                     for h in r.history):
-                r = self._authenticate(r)
+                r = self._authenticate(session, r, credentials)
 
             # Read the JSON object from the HTML page (XXX find a better solution)
             for line in r.iter_lines(decode_unicode=True):
@@ -112,102 +246,208 @@ class AmazonMusic:
                 raise Exception("Amazon Music `appConfig` could not be found (you may have triggered the captcha)")
 
             if amzn_music_config['isRecognizedCustomer'] == 0:
-                r = self.session.get(
+                r = session.get(
                     AMAZON_MUSIC_URL + AMAZON_FORCE_SIGN_IN_PATH,
                     headers={'User-Agent': USER_AGENT})
 
                 amzn_music_config = None
 
-        # Zero out the credentials so that they may not be accessed later
-        self._email = None
-        self._password = None
+        return amzn_music_config
 
-        self.device_id = amzn_music_config['deviceId']
-        self.csrf_token = amzn_music_config['CSRFTokenConfig']['csrf_token']
-        self.csrf_ts = amzn_music_config['CSRFTokenConfig']['csrf_ts']
-        self.csrf_rnd = amzn_music_config['CSRFTokenConfig']['csrf_rnd']
-        self.customer_id = amzn_music_config['customerId']
-        self.device_type = amzn_music_config['deviceType']
-        self.territory = amzn_music_config['musicTerritory']
-        self.locale = amzn_music_config['i18n']['locale']
-        self.region = REGION_MAP.get(amzn_music_config['realm'],
-                                     amzn_music_config['realm'][:2])
-        self.url = 'https://' + amzn_music_config['serverInfo']['returnUrlServer']
+    def _authenticate(self, session, r, credentials):
+        """
+        Handles the sign-in process with Amazon's login page.
 
-        target_region_cookie.value = self.url
+        :param session: The request session to sign in.
+        :param r: The response object pointing to the Amazon sign in page.
+        :param credentials: Function returning `[email, password]`.
+        """
+        with self.tracer.span('AmazonMusic._authenticate'):
+            if credentials is None:
+                raise Exception("Amazon Music requires a sign-in, but no credentials were provided")
+
+            soup = BeautifulSoup(r.content, "html.parser")
+
+            email, password = credentials()
+            query = {"email": email, "password": password}
+
+            # For each input
+            for field in soup.form.find_all("input"):
+                # If it is a hidden value (i.e.: CSRF data or temporary session variables)
+                if field.get("type") == "hidden":
+                    # Set them in the query
+                    query[field.get("name")] = field.get("value")
+
+            # Post the data using the `action` embedded inside the <form>
+            r = session.post(
+                soup.form.get("action"),
+                headers={
+                    'User-Agent':
+                        USER_AGENT,
+                    'Referer':
+                        r.history[0].headers['Location'],
+                    'Upgrade-Insecure-Requests':
+                        '1',
+                    'Accept':
+                        'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+                    'Accept-Language':
+                        'en-US,en;q=0.9'
+                },
+                data=query)
+
+            # Save cookies to disk
+            with self._cookie_lock:
+                session.cookies.save()
+
+            return r
+
+    @property
+    def session(self):
+        """
+        The current request session (replaced when the session is refreshed).
+        """
+        return self._state.session
 
-        # Store the target region inside the cookie (and write it to disk)
-        self.session.cookies.set_cookie(target_region_cookie)
-        self.session.cookies.save()
+    @property
+    def csrf_token(self):
+        return self._state.csrf['csrf_token']
 
-    def _authenticate(self, r):
+    @property
+    def csrf_ts(self):
+        return self._state.csrf['csrf_ts']
+
+    @property
+    def csrf_rnd(self):
+        return self._state.csrf['csrf_rnd']
+
+    def refresh(self, credentials=None):
         """
-        Handles the sign-in process with Amazon's login page.
+        Renew the session cookies and re-read the CSRF token from `appConfig`,
+        signing in again if Amazon asks. This is done on a copy of the session,
+        which then replaces the current one in a single step: calls in progress
+        (or started meanwhile) carry on with the old credentials and never wait.
 
-        :param r: The response object pointing to the Amazon sign in page.
+        :param credentials: (optional) Function returning `[email, password]`, called only if a sign-in is needed.
         """
-        soup = BeautifulSoup(r.content, "html.parser")
-
-        query = {"email": self._email, "password": self._password}
-
-        # For each input
-        for field in soup.form.find_all("input"):
-            # If it is a hidden value (i.e.: CSRF data or temporary session variables)
-            if field.get("type") == "hidden":
-                # Set them in the query
-                query[field.get("name")] = field.get("value")
-
-        # Post the data using the `action` embedded inside the <form>
-        r = self.session.post(
-            soup.form.get("action"),
-            headers={
-                'User-Agent':
-                    USER_AGENT,
-                'Referer':
-                    r.history[0].headers['Location'],
-                'Upgrade-Insecure-Requests':
-                    '1',
-                'Accept':
-                    'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language':
-                    'en-US,en;q=0.9'
-            },
-            data=query)
+        with self.tracer.span('AmazonMusic.refresh'):
+            current = self._state.session
+
+            session = requests.Session()
+            session.cookies = type(current.cookies)(current.cookies.filename)
+            for cookie in current.cookies:
+                session.cookies.set_cookie(copy.copy(cookie))
 
-        # Save cookies to disk
-        self.session.cookies.save()
+            r = session.get(self.url, headers={'User-Agent': USER_AGENT})
+            amzn_music_config = self._read_config(session, r, credentials)
 
-        return r
+            # Swap under the lock, so no call can save the old jar over the new one
+            with self._cookie_lock:
+                session.cookies.save()
+                self._state = _SessionState(session, amzn_music_config['CSRFTokenConfig'], time.time())
 
-    def call(self, endpoint, target, query):
+    def refresh_due(self, max_age=SESSION_MAX_AGE, margin=SESSION_REFRESH_MARGIN):
+        """
+        Return the time (as from `time.time()`) at which the session should be
+        refreshed: `margin` seconds before it is `max_age` seconds old, or before
+        the first of its sign-in cookies expires, whichever is sooner.
+
+        :param max_age: (optional) Maximum age of a session, in seconds.
+        :param margin: (optional) How long before expiry to refresh, in seconds.
+        """
+        state = self._state
+        expires = [c.expires for c in state.session.cookies
+                   if c.expires and c.name.startswith(SESSION_COOKIE_PREFIXES)]
+        return min([state.created + max_age] + expires) - margin
+
+    def start_refresher(self, max_age=SESSION_MAX_AGE, margin=SESSION_REFRESH_MARGIN, credentials=None,
+                        retry=60):
+        """
+        Start a daemon thread which refreshes the session (see `refresh`) before it
+        expires. The last failure, if any, is available as `refresh_error`.
+
+        :param max_age: (optional) Maximum age of a session, in seconds.
+        :param margin: (optional) How long before expiry to refresh, in seconds.
+        :param credentials: (optional) Function returning `[email, password]`, called only if a sign-in is needed.
+        :param retry: (optional) Minimum interval between refresh attempts, in seconds.
+        """
+        if self._refresher is not None:
+            return
+
+        stop = threading.Event()
+
+        def run():
+            while True:
+                try:
+                    due = self.refresh_due(max_age, margin)
+                except Exception:
+                    # The jar can change under us while calls are made; refresh now rather than stop
+                    due = time.time()
+                due = max(due, self._state.created + retry)
+                if stop.wait(max(due - time.time(), 0)):
+                    return
+
+                try:
+                    self.refresh(credentials)
+                    self.refresh_error = None
+                except Exception as e:
+                    self.refresh_error = e
+                    if stop.wait(retry):
+                        return
+
+        thread = threading.Thread(target=run, name='AmazonMusic refresher')
+        thread.daemon = True
+        self._refresher = (thread, stop)
+        thread.start()
+
+    def stop_refresher(self):
+        """
+        Stop the thread started by `start_refresher`, waiting for any refresh in progress.
+        """
+        if self._refresher is not None:
+            thread, stop = self._refresher
+            self._refresher = None
+            stop.set()
+            thread.join()
+
+    def call(self, endpoint, target, query, path=None):
         """
         Make a call against an endpoint and return the JSON response.
 
         :param endpoint: The URL endpoint of the request.
         :param target: The (Java?) class of the API to invoke.
         :param query: The JSON request.
+        :param path: (optional) Keys leading to the only part of the response which is needed,
+                     e.g. `('albumList', 0)`.
         """
-        query_headers = {
-            'User-Agent': USER_AGENT,
-            'csrf-token': self.csrf_token,
-            'csrf-rnd': self.csrf_rnd,
-            'csrf-ts': self.csrf_ts,
-            'X-Requested-With': 'XMLHttpRequest'
-        }
-        if target is None:  # Legacy cirrus API
-            query_data = query
-        else:
-            query_headers['X-Amz-Target'] = target
-            query_headers['Content-Type'] = 'application/json'
-            query_headers['Content-Encoding'] = 'amz-1.0'
-            query_data = json.dumps(query)
-
-        r = self.session.post(
-            '{}/{}/api/{}'.format(self.url, self.region, endpoint),
-            headers=query_headers,
-            data=query_data)
-        self.session.cookies.save()
-        return r.json()
+        with self.tracer.span('AmazonMusic.call', endpoint=endpoint, target=target):
+            # Use one snapshot throughout, in case the session is refreshed meanwhile
+            state = self._state
+            query_headers = {
+                'User-Agent': USER_AGENT,
+                'csrf-token': state.csrf['csrf_token'],
+                'csrf-rnd': state.csrf['csrf_rnd'],
+                'csrf-ts': state.csrf['csrf_ts'],
+                'X-Requested-With': 'XMLHttpRequest'
+            }
+            if target is None:  # Legacy cirrus API
+                query_data = query
+            else:
+                query_headers['X-Amz-Target'] = target
+                query_headers['Content-Type'] = 'application/json'
+                query_headers['Content-Encoding'] = 'amz-1.0'
+                query_data = self.codec.dumps(query)
+
+            r = state.session.post(
+                '{}/{}/api/{}'.format(self.url, self.region, endpoint),
+                headers=query_headers,
+                data=query_data)
+
+            # Calls may be made from several threads; only one can write the jar at a time.
+            # A call which outlived a refresh mustn't overwrite the refreshed cookies.
+            with self._cookie_lock:
+                if state is self._state:
+                    state.session.cookies.save()
+            return self.codec.loads(r.content, path)
 
     def station(self, id):
         """
@@ -231,35 +471,110 @@ class AmazonMusic:
                     }
                 }))
 
-    def album(self, id):
+    def resume_station(self, session):
+        """
+        Resume a station from the state saved by `Station.session`, without creating
+        a new queue. Tracks buffered when the session was saved are played first.
+
+        :param session: Station state, as returned by `Station.session`.
+        """
+        return Station(
+            self, session['asin'], {
+                'queue': {
+                    'queueMetadata': {
+                        'title': session['name'],
+                        'imageUrlMap': {
+                            'FULL': session['coverUrl']
+                        }
+                    },
+                    'pageToken': session['pageToken']
+                },
+                'trackMetadataList': session['trackMetadataList']
+            })
+
+    def _canonical(self, cls, data):
+        """
+        Return the `Album` or `Track` described by `data`: the canonical object for
+        its identifier in `identities`, with `data` merged into it, or a new one.
+
+        :param cls: `Album` or `Track`.
+        :param data: JSON data structure for the object, from Amazon Music.
+        """
+        identifier_type, identifier = cls._key(data)
+        if identifier is None:
+            return cls(self, data)
+
+        return self.identities.setdefault(
+            (cls.__name__, identifier_type, identifier), lambda: cls(self, data), lambda obj: obj._merge(data))
+
+    def _lookup(self, asins, path, expand=True):
+        """
+        Look up catalog items with the `muse` API.
+
+        :param asins: ASINs to look up.
+        :param path: Part of the response to return, e.g. `('albumList', 0)`.
+        :param expand: (optional) Include the full details of each track of an album or playlist.
+        """
+        features = ['popularity', 'trackLibraryAvailability', 'collectionLibraryAvailability']
+        if expand:
+            features.insert(1, 'expandTracklist')
+
+        return self.call(
+            'muse/legacy/lookup',
+            'com.amazon.musicensembleservice.MusicEnsembleService.lookup',
+            {
+                'asins': list(asins),
+                'features': features,
+                'requestedContent':
+                    self._amazon_subscription,
+                'deviceId':
+                    self.device_id,
+                'deviceType':
+                    self.device_type,
+                'musicTerritory':
+                    self.territory,
+                'customerId':
+                    self.customer_id
+            }, path)
+
+    def album(self, id, expand=True):
         """
         Get an album that can be played.
 
         param albumId: Album ID, for example `B00J9AEZ7G`.
+        :param expand: (optional) Fetch the details of every track up front. If false, they are
+                       fetched in chunks as `Album.stream_tracks` reaches them.
         """
-        return Album(
-            self,
-            self.call(
-                'muse/legacy/lookup',
-                'com.amazon.musicensembleservice.MusicEnsembleService.lookup',
-                {
-                    'asins': [id],
-                    'features': [
-                        'popularity', 'expandTracklist',
-                        'trackLibraryAvailability',
-                        'collectionLibraryAvailability'
-                    ],
-                    'requestedContent':
-                        self._amazon_subscription,
-                    'deviceId':
-                        self.device_id,
-                    'deviceType':
-                        self.device_type,
-                    'musicTerritory':
-                        self.territory,
-                    'customerId':
-                        self.customer_id
-                })['albumList'][0])
+        with self.tracer.span('AmazonMusic.album', asin=id):
+            return self._canonical(Album, self._lookup([id], ('albumList', 0), expand))
+
+    def tracks(self, ids):
+        """
+        Get the tracks with the given ASINs, in the same order. Raises `KeyError`
+        if any of them are not found.
+
+        :param ids: Track ASINs.
+        """
+        found = {t['asin']: t for t in self._lookup(ids, ('trackList',))}
+        missing = [id for id in ids if id not in found]
+        if missing:
+            raise KeyError('tracks not found: {}'.format(', '.join(missing)))
+
+        return [self._canonical(Track, found[id]) for id in ids]
+
+    def hydrate_albums(self, items, processes=None, chunk_size=hydrate.CHUNK_SIZE):
+        """
+        Look up many albums in parallel on a pool of worker processes, yielding
+        `(asin, record, error)` for each in input order: `record` is a compact `dict`,
+        or `None` with `error` describing why the album could not be read. The
+        workers share this object's session (including any refresh) instead of
+        each signing in.
+
+        :param items: Iterable of album ASINs or `Album` objects (e.g. from `albums_in_library`).
+        :param processes: (optional) Number of worker processes, defaults to the number of CPUs.
+        :param chunk_size: (optional) Number of albums looked up per request.
+        """
+        return hydrate.hydrate_albums(self.snapshot, items, processes, chunk_size)
 
     def albums_in_library(self):
         """
@@ -300,52 +615,34 @@ class AmazonMusic:
             'customerInfo.deviceType': self.device_type,
         }
 
-        data = self.call('cirrus/', None,
-                         query)['searchLibraryResponse']['searchLibraryResult']
+        path = ('searchLibraryResponse', 'searchLibraryResult')
+        with self.tracer.span('AmazonMusic.albums_in_library', page=1):
+            data = self.call('cirrus/', None, query, path)
+        page = 1
         results = []
         results.extend(data['searchReturnItemList'])
         while results:
             r = results.pop(0)
             if r['numTracks'] >= 4 and r['metadata'].get(
                     'primeStatus') == 'PRIME':
-                yield Album(self, r)
+                yield self._canonical(Album, r)
 
             if not results and data['nextResultsToken']:
                 query['nextResultsToken'] = data['nextResultsToken']
-                data = self.call(
-                    'cirrus/', None,
-                    query)['searchLibraryResponse']['searchLibraryResult']
+                page += 1
+                with self.tracer.span('AmazonMusic.albums_in_library', page=page):
+                    data = self.call('cirrus/', None, query, path)
                 results.extend(data['searchReturnItemList'])
 
-    def playlist(self, id):
+    def playlist(self, id, expand=True):
         """
         Get a playlist that can be played.
 
         :param id: Playlist ID, for example `B075QGZDZ3`.
+        :param expand: (optional) Fetch the details of every track up front. If false, they are
+                       fetched in chunks as `Playlist.stream_tracks` reaches them.
         """
-        return Playlist(
-            self,
-            self.call(
-                'muse/legacy/lookup',
-                'com.amazon.musicensembleservice.MusicEnsembleService.lookup',
-                {
-                    'asins': [id],
-                    'features': [
-                        'popularity', 'expandTracklist',
-                        'trackLibraryAvailability',
-                        'collectionLibraryAvailability'
-                    ],
-                    'requestedContent':
-                        self._amazon_subscription,
-                    'deviceId':
-                        self.device_id,
-                    'deviceType':
-                        self.device_type,
-                    'musicTerritory':
-                        self.territory,
-                    'customerId':
-                        self.customer_id
-                })['playlistList'][0])
+        return Playlist(self, self._lookup([id], ('playlistList', 0), expand))
 
     def search(self,
                query,
@@ -463,4 +760,4 @@ class AmazonMusic:
             [[r['label'], r] for r in self.call(
                 'search/v1_1/',
                 'com.amazon.tenzing.v1_1.TenzingServiceExternalV1_1.search',
-                query_obj)['results']])
\ No newline at end of file
+                query_obj, ('results',))])
\ No newline at end of file
@@ -0,0 +1,231 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Batch command line interface. Reads ASINs (or search terms) one per line from
+files or stdin, and writes one JSON object per line to stdout as each item
+completes:
+
+    python -m amazon_music album asins.txt > albums.ndjson
+    python -m amazon_music playlist --urls -j 8 < playlists.txt
+    python -m amazon_music search -t 'Adele 25'
+
+Progress and throughput are reported on stderr.
+"""
+
+import argparse
+import concurrent.futures
+import fileinput
+import json
+import os
+import sys
+import time
+
+from getpass import getpass
+
+from . import AmazonMusic
+from .internal import Tracer
+from .internal.hydrate import album_record, track_record
+
+
+def _album(amzn, asin, urls):
+    return album_record(amzn.album(asin), urls)
+
+
+def _playlist(amzn, asin, urls):
+    playlist = amzn.playlist(asin)
+    return {
+        'asin': playlist.id,
+        'name': playlist.name,
+        'genre': playlist.genre,
+        'rating': playlist.rating,
+        'trackCount': playlist.track_count,
+        'coverUrl': playlist.cover_url,
+        'tracks': [track_record(t, urls) for t in playlist.tracks()]
+    }
+
+
+def _search(amzn, query, urls):
+    return dict(amzn.search(query))
+
+
+COMMANDS = {'album': _album, 'playlist': _playlist, 'search': _search}
+
+
+class Progress:
+    """
+    Prints the number of completed items and the throughput to stderr, at most
+    once per `interval` seconds.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.started = self._printed = time.time()
+        self.done = 0
+        self.failed = 0
+
+    def update(self, failed, final=False):
+        if failed is not None:
+            self.done += 1
+            self.failed += failed
+
+        now = time.time()
+        if final or now - self._printed >= self.interval:
+            self._printed = now
+            elapsed = max(now - self.started, 1e-9)
+            sys.stderr.write('{} done, {} failed, {:.2f} items/s, {:.1f}s elapsed\n'.format(
+                self.done, self.failed, self.done / elapsed, elapsed))
+            sys.stderr.flush()
+
+
+def _inputs(files):
+    for line in fileinput.input(files):
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield line
+
+
+def run(amzn, command, items, jobs, urls, progress, out=sys.stdout):
+    """
+    Run `command` for each of `items` on `jobs` threads, writing each result to
+    `out` as a line of JSON as soon as it completes. At most `2 * jobs` items are
+    read ahead of the results, so arbitrarily long inputs can be streamed.
+
+    :param amzn: AmazonMusic object, used to make API calls.
+    :param command: Name of the command from `COMMANDS`.
+    :param items: Iterable of ASINs or search terms.
+    :param jobs: Number of items processed in parallel.
+    :param urls: Whether to resolve the stream URL of each track.
+    :param progress: :class:`Progress <Progress>` updated as each item completes.
+    :param out: (optional) File the results are written to.
+    """
+    fn = COMMANDS[command]
+    items = iter(items)
+    pending = {}
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        while True:
+            for item in items:
+                pending[executor.submit(fn, amzn, item, urls)] = item
+                if len(pending) >= 2 * jobs:
+                    break
+
+            if not pending:
+                break
+
+            completed, _ = concurrent.futures.wait(
+                pending, timeout=progress.interval, return_when=concurrent.futures.FIRST_COMPLETED)
+            progress.update(None)
+
+            for future in completed:
+                item = pending.pop(future)
+                record = {'command': command, 'input': item}
+                try:
+                    record['result'] = future.result()
+                except Exception as e:
+                    record['error'] = '{}: {}'.format(type(e).__name__, e)
+
+                out.write(json.dumps(record, sort_keys=True) + '\n')
+                out.flush()
+                progress.update('error' in record)
+
+    progress.update(None, final=True)
+    return progress.failed
+
+
+def run_processes(amzn, items, processes, progress, out=sys.stdout):
+    """
+    Look up albums on `processes` worker processes (see `AmazonMusic.hydrate_albums`),
+    writing each result to `out` as a line of JSON, in input order.
+
+    :param amzn: AmazonMusic object, whose session the workers share.
+    :param items: Iterable of album ASINs.
+    :param processes: Number of worker processes.
+    :param progress: :class:`Progress <Progress>` updated as each item completes.
+    :param out: (optional) File the results are written to.
+    """
+    for asin, result, error in amzn.hydrate_albums(items, processes):
+        record = {'command': 'album', 'input': asin}
+        if error is None:
+            record['result'] = result
+        else:
+            record['error'] = error
+
+        out.write(json.dumps(record, sort_keys=True) + '\n')
+        out.flush()
+        progress.update('error' in record)
+
+    progress.update(None, final=True)
+    return progress.failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m amazon_music',
+        description='Look up albums, playlists or search terms in bulk, writing NDJSON to stdout.')
+    parser.add_argument('command', choices=sorted(COMMANDS),
+                        help='Type of lookup to make for each input line.')
+    parser.add_argument('files', nargs='*', metavar='FILE',
+                        help='Files with one ASIN or search term per line (default: stdin). '
+                             'For `search`, terms may be given directly instead, with -t.')
+    parser.add_argument('-t', '--terms', action='store_true',
+                        help='Treat the positional arguments as the inputs themselves, rather than files.')
+    parser.add_argument('-j', '--jobs', type=int, default=4,
+                        help='Number of lookups to run in parallel (default: 4).')
+    parser.add_argument('-p', '--processes', type=int, metavar='N',
+                        help='For `album`, look up on N worker processes sharing one session, '
+                             'writing results in input order.')
+    parser.add_argument('--urls', action='store_true',
+                        help='Also resolve the stream URL of every track.')
+    parser.add_argument('--progress', type=float, default=5.0, metavar='SECONDS',
+                        help='Interval between progress reports on stderr (default: 5).')
+    parser.add_argument('--email', default=os.environ.get('AMAZON_MUSIC_EMAIL'),
+                        help='Amazon account email, if a sign-in is needed (default: $AMAZON_MUSIC_EMAIL).')
+    parser.add_argument('--cookies', metavar='PATH',
+                        help='Cookie jar to use (default: ~/.amzn.cookies).')
+    parser.add_argument('--trace', metavar='PATH',
+                        help='Write a Chrome trace-event timeline of the run to PATH.')
+    # Options may come before or after the file names
+    args = parser.parse_intermixed_args(argv)
+
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+    if args.processes is not None and (args.command != 'album' or args.urls or args.processes < 1):
+        parser.error('--processes needs the `album` command, without --urls, and at least 1 process')
+
+    # The password is read from the terminal (not stdin, which may hold the inputs)
+    password = os.environ.get('AMAZON_MUSIC_PASSWORD')
+    if args.email and password is None:
+        password = getpass('Amazon password: ')
+
+    tracer = Tracer() if args.trace else None
+    try:
+        amzn = AmazonMusic(email=args.email, password=password, cookie_cache_path=args.cookies,
+                           tracer=tracer)
+
+        # Long jobs outlive the session, so renew it in the background
+        amzn.start_refresher(credentials=(lambda: [args.email, password]) if args.email else None)
+
+        items = args.files if args.terms else _inputs(args.files or ['-'])
+        if args.processes:
+            failed = run_processes(amzn, items, args.processes, Progress(args.progress))
+        else:
+            failed = run(amzn, args.command, items, args.jobs, args.urls, Progress(args.progress))
+    finally:
+        if tracer is not None:
+            tracer.export_chrome(args.trace)
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
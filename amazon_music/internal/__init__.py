@@ -1,4 +1,9 @@
 from .album import Album
+from .artwork import Artwork
+from .bitrate import BitrateSelector
+from .codec import Codec
+from .identity import IdentityMap
+from .trace import NullTracer, Span, Tracer
 from .playlist import Playlist
 from .station import Station
-from .track import Track
\ No newline at end of file
+from .track import Track
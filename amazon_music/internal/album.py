@@ -11,6 +11,7 @@
 # limitations under the License.
 
 from .track import Track
+from .tracklist import CHUNK_SIZE, PREFETCH, is_summary, stream_tracks
 
 
 class Album:
@@ -29,6 +30,7 @@ class Album:
     * `trackCount` - Number of tracks.
     * `releaseDate` - UNIX timestamp of the original release date.
     * `tracks` - Iterable generator for the `Tracks` that make up this station.
+    * `stream_tracks` - Generator for the `Tracks`, fetched in chunks as they are reached.
     """
 
     def __init__(self, amzn, data):
@@ -39,9 +41,28 @@ class Album:
         :param data: JSON data structure for the album, from Amazon Music. Supports both `muse` and `cirrus` formats.
         """
         self._amzn = amzn
-        self.json = data
+        self._full = False
+        self._merge(data)
 
+    @staticmethod
+    def _key(data):
+        """
+        Return the identifier of the album described by `data` (see `AmazonMusic.identities`).
+        """
+        if 'metadata' in data:
+            return 'ASIN', data['metadata'].get('albumAsin')
+        return 'ASIN', data.get('asin')
+
+    def _merge(self, data):
+        """
+        Update the album from `data`. Once the album has `muse` data, a `cirrus`
+        summary is ignored and further `muse` data is merged into it, keeping any
+        expanded tracks.
+        """
         if 'metadata' in data:
+            if self._full:
+                return
+
             self.track_count = data['numTracks']
             self.json = data['metadata']
 
@@ -56,6 +77,15 @@ class Album:
             self.rating = None
             self.release_date = None
         else:
+            if self._full:
+                tracks = self.json.get('tracks')
+                data = dict(self.json, **data)
+                # Don't swap expanded tracks for the summaries of an `expand=False` lookup
+                if tracks and any(is_summary(t) for t in data.get('tracks', ())) \
+                        and not any(is_summary(t) for t in tracks):
+                    data['tracks'] = tracks
+
+            self.json = data
             self.id = data['asin']
             self.cover_url = data['image']
             self.name = data['title']
@@ -64,6 +94,7 @@ class Album:
             self.rating = data['reviews']['average']
             self.track_count = data['trackCount']
             self.release_date = data['originalReleaseDate'] / 1000
+            self._full = True
 
     def tracks(self):
         """
@@ -72,6 +103,28 @@ class Album:
         # If we've only got a summary, load the full data
         if 'tracks' not in self.json:
             a = self._amzn.album(self.id)
-            self.__init__(self._amzn, a.json)
+            if a is not self:
+                self._merge(a.json)
+
+        if any(is_summary(t) for t in self.json['tracks']):
+            return list(self.stream_tracks(prefetch=0))
+
+        return list([self._amzn._canonical(Track, t) for t in self.json['tracks']])
+
+    def stream_tracks(self, chunk_size=CHUNK_SIZE, prefetch=PREFETCH):
+        """
+        Provides an iterable generator for the `Tracks` that make up this album.
+        For an album fetched with `AmazonMusic.album(id, expand=False)`, the
+        tracks are looked up `chunk_size` at a time as they are reached, and the
+        stream URLs of the first `prefetch` tracks start resolving straight away.
+
+        :param chunk_size: (optional) Number of tracks looked up per request.
+        :param prefetch: (optional) Number of stream URLs to resolve in the background, or `0` for none.
+        """
+        # If we've only got a summary, load the tracklist (without the track details)
+        if 'tracks' not in self.json:
+            a = self._amzn.album(self.id, expand=False)
+            if a is not self:
+                self._merge(a.json)
 
-        return list([Track(self._amzn, t) for t in self.json['tracks']])
+        return stream_tracks(self._amzn, self.json['tracks'], chunk_size, prefetch)
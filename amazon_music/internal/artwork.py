@@ -0,0 +1,217 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import concurrent.futures
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+
+
+class Artwork:
+    """
+    Downloads cover art (the `cover_url` of albums, playlists, stations and
+    tracks) into an on-disk cache, so that each image is only fetched once.
+
+    * Downloads run on a bounded thread pool; requests for a URL which is
+      already being fetched share the same download.
+    * The least recently used images are removed once the cache grows past
+      `max_bytes`.
+    * Images older than `max_age` are revalidated with `If-None-Match` and
+      `If-Modified-Since`, so unchanged images are not downloaded again.
+
+    Usage:
+
+      >>> for url, path in amzn.artwork.fetch_many(amzn.albums_in_library()):
+      ...     print(url, path)
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=256 * 1024 * 1024, max_age=24 * 60 * 60, workers=8,
+                 user_agent=None):
+        """
+        :param cache_dir: (optional) Directory for the cache, by default `.amzn.artwork` in the home directory.
+        :param max_bytes: (optional) Maximum total size of the cached images.
+        :param max_age: (optional) Seconds before a cached image is revalidated with the server.
+        :param workers: (optional) Maximum number of simultaneous downloads.
+        :param user_agent: (optional) `User-Agent` header for the downloads.
+        """
+        self.cache_dir = cache_dir or os.path.join(
+            os.environ.get('HOME', os.environ.get('LOCALAPPDATA', os.getcwd())), '.amzn.artwork')
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+        self._session = requests.Session()
+        if user_agent:
+            self._session.headers['User-Agent'] = user_agent
+
+        self._workers = workers
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._size = None
+
+    def path(self, url):
+        """
+        Return the path at which the image for `url` is (or would be) cached.
+
+        :param url: Image URL.
+        """
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest())
+
+    def submit(self, url):
+        """
+        Start fetching `url` (if it is not already being fetched), returning a
+        `Future` for the path of the cached image.
+
+        :param url: Image URL.
+        """
+        with self._lock:
+            future = self._pending.get(url)
+            if future is not None:
+                return future
+            future = self._pending[url] = self._executor.submit(self._fetch, url)
+
+        # Outside the lock: a future which has already finished runs the callback straight away
+        future.add_done_callback(lambda f: self._done(url, f))
+        return future
+
+    def fetch(self, url):
+        """
+        Return the path of the cached image for `url`, downloading it if needed.
+
+        :param url: Image URL.
+        """
+        return self.submit(url).result()
+
+    def fetch_many(self, items):
+        """
+        Fetch the images for many URLs (or objects with a `cover_url`) in parallel.
+        Yields `(url, path)` pairs as each completes, or `(url, None)` if it failed.
+        Each distinct URL is fetched once, however many items share it. At most
+        two downloads per worker are started ahead of the results, so `items` may
+        be a long-running generator such as `AmazonMusic.albums_in_library`.
+
+        :param items: Iterable of URLs, or of `Album`, `Playlist`, `Station` or `Track` objects.
+        """
+        items = iter(items)
+        seen = set()
+        pending = {}
+
+        while True:
+            for item in items:
+                url = item if isinstance(item, str) else item.cover_url
+                if url and url not in seen:
+                    seen.add(url)
+                    pending[self.submit(url)] = url
+                    if len(pending) >= 2 * self._workers:
+                        break
+
+            if not pending:
+                break
+
+            completed, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in completed:
+                yield pending.pop(future), None if future.exception() else future.result()
+
+    def _done(self, url, future):
+        with self._lock:
+            if self._pending.get(url) is future:
+                del self._pending[url]
+
+    def _fetch(self, url):
+        path = self.path(url)
+        meta_path = path + '.json'
+
+        headers = {}
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except (IOError, ValueError):
+            meta = None
+
+        if meta is not None and os.path.isfile(path):
+            if time.time() - meta['fetched'] < self.max_age:
+                os.utime(path, None)
+                return path
+
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('lastModified'):
+                headers['If-Modified-Since'] = meta['lastModified']
+
+        r = self._session.get(url, headers=headers)
+        if r.status_code == 304:
+            # Only a conditional request (for an image already cached) can be answered with this
+            if not headers:
+                raise requests.HTTPError('304 Not Modified for unconditional request: {}'.format(url),
+                                         response=r)
+            meta['fetched'] = time.time()
+            self._write(meta_path, json.dumps(meta).encode('utf-8'))
+            os.utime(path, None)
+            return path
+
+        r.raise_for_status()
+
+        previous = os.path.getsize(path) if os.path.isfile(path) else 0
+        self._write(path, r.content)
+        self._write(meta_path, json.dumps({
+            'url': url,
+            'etag': r.headers.get('ETag'),
+            'lastModified': r.headers.get('Last-Modified'),
+            'fetched': time.time()
+        }).encode('utf-8'))
+
+        self._grow(len(r.content) - previous, keep=path)
+        return path
+
+    def _write(self, path, content):
+        # Write then rename, so that readers never see a partial file
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+        tmp = '{}.{}.tmp'.format(path, threading.get_ident())
+        with open(tmp, 'wb') as f:
+            f.write(content)
+        os.replace(tmp, path)
+
+    def _images(self):
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if '.' not in name and os.path.isfile(path):
+                yield path, os.stat(path)
+
+    def _grow(self, delta, keep=None):
+        with self._lock:
+            if self._size is None:
+                self._size = sum(st.st_size for _, st in self._images())
+            else:
+                self._size += delta
+
+            if self._size <= self.max_bytes:
+                return
+
+            # Evict the least recently used images (by modification time, which is updated on use),
+            # but never `keep`, the image just written, whose path is about to be returned
+            for path, st in sorted(self._images(), key=lambda i: i[1].st_mtime):
+                if self._size <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                for p in (path, path + '.json'):
+                    try:
+                        os.remove(p)
+                    except OSError:
+                        pass
+                self._size -= st.st_size
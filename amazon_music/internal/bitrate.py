@@ -0,0 +1,107 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import threading
+
+# Bitrate tiers accepted by `getRestrictedStreamingURL`, lowest first, with
+# their approximate bitrate in kbit/s
+BITRATES = collections.OrderedDict([('LOW', 64), ('MEDIUM', 128), ('HIGH', 256)])
+
+
+class BitrateSelector:
+    """
+    Chooses the bitrate tier for `Track.url` and `Track.segments` from the
+    measured throughput of segment downloads, stepping down when the link
+    cannot sustain the current tier and back up when it recovers.
+
+    The library downloads no audio itself, so measuring is the player's job: it
+    reports each segment it downloads with `record`, and the audio it plays with
+    `played`. Until anything is recorded, the highest permitted tier is used, and
+    without reports the tier never steps down.
+
+    Key properties are:
+
+    * `max_bitrate` - Highest tier which may be chosen, e.g. `MEDIUM` on mobile data.
+    * `throughput` - Smoothed download throughput, in bit/s (`None` until measured).
+    * `buffer` - Estimated seconds of audio downloaded ahead of playback.
+    """
+
+    def __init__(self, max_bitrate='HIGH', safety=1.5, min_buffer=10, smoothing=0.3):
+        """
+        :param max_bitrate: (optional) Highest tier which may be chosen.
+        :param safety: (optional) Throughput needed for a tier, as a multiple of its bitrate.
+        :param min_buffer: (optional) Seconds of buffered audio below which twice the safety margin is needed.
+        :param smoothing: (optional) Weight of each new measurement in the throughput average.
+        """
+        if max_bitrate not in BITRATES:
+            raise ValueError('Unknown bitrate `{}`, expected one of {}'.format(max_bitrate, list(BITRATES)))
+
+        self.max_bitrate = max_bitrate
+        self.safety = safety
+        self.min_buffer = min_buffer
+        self.smoothing = smoothing
+        self.throughput = None
+        self.buffer = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, size, seconds, duration=None):
+        """
+        Report a downloaded segment.
+
+        :param size: Size of the segment, in bytes.
+        :param seconds: Time taken to download it.
+        :param duration: (optional) Seconds of audio in the segment, added to the estimated buffer
+                         (which `played` drains).
+        """
+        with self._lock:
+            rate = size * 8 / max(seconds, 1e-3)
+            if self.throughput is None:
+                self.throughput = rate
+            else:
+                self.throughput += self.smoothing * (rate - self.throughput)
+
+            if duration is not None:
+                self.buffer += duration
+
+    def played(self, seconds):
+        """
+        Report that audio has been played, draining the estimated buffer.
+
+        :param seconds: Seconds of audio played.
+        """
+        with self._lock:
+            self.buffer = max(self.buffer - seconds, 0.0)
+
+    def select(self):
+        """
+        Return the highest permitted tier which the measured throughput can sustain,
+        or the lowest tier if none can.
+        """
+        with self._lock:
+            tiers = list(BITRATES)[:list(BITRATES).index(self.max_bitrate) + 1]
+            if self.throughput is None:
+                return tiers[-1]
+
+            margin = self.safety if self.buffer >= self.min_buffer else self.safety * 2
+            for tier in reversed(tiers):
+                if self.throughput >= BITRATES[tier] * 1000 * margin:
+                    return tier
+            return tiers[0]
+
+    def reset(self):
+        """
+        Forget the measurements, e.g. after changing network.
+        """
+        with self._lock:
+            self.throughput = None
+            self.buffer = 0.0
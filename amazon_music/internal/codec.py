@@ -0,0 +1,84 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+# Faster JSON libraries are used when installed, otherwise the standard
+# library is used
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+BACKENDS = ('orjson', 'ujson', 'json')
+
+
+def available_backends():
+    """
+    Return the names of the JSON backends which can be used, fastest first.
+    """
+    return [b for b in BACKENDS if b == 'json' or globals()[b] is not None]
+
+
+class Codec:
+    """
+    Encodes request bodies and decodes response bodies for `AmazonMusic.call`.
+
+    By default the fastest installed backend (`orjson`, then `ujson`) is used,
+    falling back to the standard `json` module.
+    """
+
+    def __init__(self, backend=None):
+        """
+        :param backend: (optional) One of `orjson`, `ujson` or `json`. Defaults to the fastest installed.
+        """
+        if backend is None:
+            backend = available_backends()[0]
+        elif backend not in available_backends():
+            raise ValueError('JSON backend `{}` is not available'.format(backend))
+
+        self.backend = backend
+
+        if backend == 'orjson':
+            self._dumps, self._loads = orjson.dumps, orjson.loads
+        elif backend == 'ujson':
+            self._dumps, self._loads = ujson.dumps, ujson.loads
+        else:
+            self._dumps, self._loads = json.dumps, json.loads
+
+    def dumps(self, obj):
+        """
+        Encode a request body. Depending on the backend this is `str` or `bytes`,
+        both of which can be posted directly.
+
+        :param obj: The JSON request.
+        """
+        return self._dumps(obj)
+
+    def loads(self, data, path=None):
+        """
+        Decode a response body, optionally returning only part of it.
+
+        :param data: Response body, as `bytes` or `str`.
+        :param path: (optional) Sequence of keys (and list indices) leading to the wanted sub-object,
+                     for example `('albumList', 0)`.
+        """
+        obj = self._loads(data)
+        for key in path or ():
+            obj = obj[key]
+        return obj
+
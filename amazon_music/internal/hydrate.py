@@ -0,0 +1,180 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import concurrent.futures
+import multiprocessing
+import os
+
+from concurrent.futures.process import BrokenProcessPool
+
+from .album import Album
+
+# Number of albums looked up per request (and per task sent to a worker)
+CHUNK_SIZE = 20
+
+# The AmazonMusic object of a worker process, made from the parent's latest snapshot
+_worker = None
+_worker_created = None
+
+
+def track_record(track, urls=False):
+    """
+    Return the details of a `Track` as a compact, JSON-serialisable `dict`.
+
+    :param track: Track to describe.
+    :param urls: (optional) Also resolve its stream URL.
+    """
+    record = {
+        'identifier': track.identifier,
+        'identifierType': track.identifier_type,
+        'name': track.name,
+        'artist': track.artist,
+        'album': track.album,
+        'albumArtist': track.album_artist,
+        'coverUrl': track.cover_url,
+        'duration': track.duration
+    }
+    if urls:
+        record['url'] = track.url()
+    return record
+
+
+def album_record(album, urls=False):
+    """
+    Return the details of an `Album` (and its tracks) as a compact, JSON-serialisable `dict`.
+
+    :param album: Album to describe.
+    :param urls: (optional) Also resolve the stream URL of each track.
+    """
+    return {
+        'asin': album.id,
+        'name': album.name,
+        'artist': album.artist,
+        'genre': album.genre,
+        'rating': album.rating,
+        'trackCount': album.track_count,
+        'releaseDate': album.release_date,
+        'coverUrl': album.cover_url,
+        'tracks': [track_record(t, urls) for t in album.tracks()]
+    }
+
+
+def _worker_for(snapshot):
+    """
+    Return the worker's AmazonMusic object, remaking it whenever the parent has
+    refreshed its session since the last chunk.
+    """
+    global _worker, _worker_created
+    if _worker is None or snapshot['created'] != _worker_created:
+        from .. import AmazonMusic
+        _worker = AmazonMusic.from_snapshot(snapshot)
+        _worker_created = snapshot['created']
+    return _worker
+
+
+def _error(e):
+    return '{}: {}'.format(type(e).__name__, e)
+
+
+def _hydrate_chunk(snapshot, asins):
+    """
+    Look up a chunk of albums in a worker, returning `(asin, record, error)` for
+    each ASIN, in order. A failure affects only the albums it concerns.
+    """
+    try:
+        amzn = _worker_for(snapshot)
+        albums = amzn._lookup(asins, ('albumList',))
+    except Exception as e:
+        return [(asin, None, _error(e)) for asin in asins]
+
+    found = {}
+    for data in albums:
+        asin = data.get('asin')
+        try:
+            found[asin] = (album_record(amzn._canonical(Album, data)), None)
+        except Exception as e:
+            found[asin] = (None, _error(e))
+
+    return [(asin,) + found.get(asin, (None, 'not found')) for asin in asins]
+
+
+def hydrate_albums(snapshot, items, processes=None, chunk_size=CHUNK_SIZE):
+    """
+    Look up albums on a pool of worker processes, yielding `(asin, record, error)`
+    for each item in input order, as soon as it and every item before it are
+    complete. `record` is an `album_record`, or `None` if the album was not found
+    or could not be read, in which case `error` describes why.
+
+    Workers use the parent's session rather than signing in: each chunk of
+    `chunk_size` ASINs (costing one lookup) is sent with the current snapshot,
+    so a session refreshed by the parent reaches the workers too. At most two
+    chunks per worker are queued ahead of the results, so `items` may be a
+    long-running generator such as `AmazonMusic.albums_in_library`.
+
+    Workers are started with `spawn`, as the parent may be running threads
+    (such as the session refresher) which must not be forked, so the calling
+    script needs the usual `if __name__ == '__main__':` guard. If a worker dies,
+    the albums it had been sent are reported as errors and a new pool carries on.
+
+    :param snapshot: Function returning the current session, e.g. `AmazonMusic.snapshot`.
+    :param items: Iterable of album ASINs or `Album` objects.
+    :param processes: (optional) Number of worker processes, defaults to the number of CPUs.
+    :param chunk_size: (optional) Number of albums looked up per request.
+    """
+    processes = processes or os.cpu_count() or 1
+    pending = collections.deque()
+
+    def chunks():
+        chunk = []
+        for item in items:
+            chunk.append(item if isinstance(item, str) else item.id)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def results():
+        chunk, future = pending.popleft()
+        try:
+            return future.result()
+        except Exception as e:
+            # The worker itself failed (e.g. it was killed): report each album of the chunk
+            return [(asin, None, _error(e)) for asin in chunk]
+
+    def pool():
+        return concurrent.futures.ProcessPoolExecutor(
+            max_workers=processes, mp_context=multiprocessing.get_context('spawn'))
+
+    executor = pool()
+    try:
+        for chunk in chunks():
+            try:
+                future = executor.submit(_hydrate_chunk, snapshot(), chunk)
+            except BrokenProcessPool:
+                # A worker died, which breaks the whole pool: chunks already sent to it
+                # are reported as errors, and the rest go to a new one
+                executor.shutdown(wait=False)
+                executor = pool()
+                future = executor.submit(_hydrate_chunk, snapshot(), chunk)
+
+            pending.append((chunk, future))
+            while len(pending) > 2 * processes or (pending and pending[0][1].done()):
+                for result in results():
+                    yield result
+
+        while pending:
+            for result in results():
+                yield result
+    finally:
+        executor.shutdown()
@@ -0,0 +1,86 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import threading
+import weakref
+
+
+class IdentityMap:
+    """
+    Maps identifiers to the single canonical object for them, so that the same
+    album or track looked up several times is one object (sharing its resolved
+    stream URL, full track listing, etc.).
+
+    Objects are held by weak references, so they are dropped once nothing else
+    uses them. Optionally, the `strong` most recently used objects are also kept
+    alive by the map itself.
+    """
+
+    def __init__(self, strong=0):
+        """
+        :param strong: (optional) Number of recently used objects to keep alive, defaults to none.
+        """
+        self.strong = strong
+        self._weak = weakref.WeakValueDictionary()
+        self._recent = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._weak)
+
+    def get(self, key):
+        """
+        Return the object for `key`, or `None`.
+
+        :param key: Identifier tuple, e.g. `('Track', 'ASIN', 'B00J9AEZ7G')`.
+        """
+        with self._lock:
+            obj = self._weak.get(key)
+            if obj is not None:
+                self._touch(key, obj)
+            return obj
+
+    def setdefault(self, key, create, merge=None):
+        """
+        Return the object for `key`, calling `create()` to make (and store) it if
+        there is none, or else `merge(obj)` to update the existing one. Both are
+        called with the map locked, so no two threads create or update an object
+        at the same time.
+
+        :param key: Identifier tuple, e.g. `('Track', 'ASIN', 'B00J9AEZ7G')`.
+        :param create: Function returning a new object for `key`.
+        :param merge: (optional) Function updating the existing object for `key`.
+        """
+        with self._lock:
+            obj = self._weak.get(key)
+            if obj is None:
+                obj = self._weak[key] = create()
+            elif merge is not None:
+                merge(obj)
+            self._touch(key, obj)
+            return obj
+
+    def clear(self):
+        """
+        Forget all objects.
+        """
+        with self._lock:
+            self._weak.clear()
+            self._recent.clear()
+
+    def _touch(self, key, obj):
+        if self.strong:
+            self._recent[key] = obj
+            self._recent.move_to_end(key)
+            while len(self._recent) > self.strong:
+                self._recent.popitem(last=False)
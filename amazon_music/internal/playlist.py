@@ -11,6 +11,7 @@
 # limitations under the License.
 
 from .track import Track
+from .tracklist import CHUNK_SIZE, PREFETCH, is_summary, stream_tracks
 
 
 class Playlist:
@@ -26,6 +27,7 @@ class Playlist:
     * `rating` - Average review score (out of 5).
     * `trackCount` - Number of tracks.
     * `tracks` - Iterable generator for the `Tracks` that make up this station.
+    * `stream_tracks` - Generator for the `Tracks`, fetched in chunks as they are reached.
     """
 
     def __init__(self, amzn, data):
@@ -48,4 +50,19 @@ class Playlist:
         """
         Provide the list for the `Tracks` that make up this album.
         """
-        return list([Track(self._amzn, t) for t in self.json['tracks']])
+        if any(is_summary(t) for t in self.json['tracks']):
+            return list(self.stream_tracks(prefetch=0))
+
+        return list([self._amzn._canonical(Track, t) for t in self.json['tracks']])
+
+    def stream_tracks(self, chunk_size=CHUNK_SIZE, prefetch=PREFETCH):
+        """
+        Provides an iterable generator for the `Tracks` that make up this playlist.
+        For a playlist fetched with `AmazonMusic.playlist(id, expand=False)`, the
+        tracks are looked up `chunk_size` at a time as they are reached, and the
+        stream URLs of the first `prefetch` tracks start resolving straight away.
+
+        :param chunk_size: (optional) Number of tracks looked up per request.
+        :param prefetch: (optional) Number of stream URLs to resolve in the background, or `0` for none.
+        """
+        return stream_tracks(self._amzn, self.json['tracks'], chunk_size, prefetch)
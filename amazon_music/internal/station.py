@@ -23,6 +23,7 @@ class Station:
     * `name` - Name of the station.
     * `coverUrl` - URL containing cover art for the station.
     * `tracks` - Iterable generator for the `Tracks` that make up this station.
+    * `session` - State which allows the station to be resumed with `AmazonMusic.resume_station`.
     """
 
     def __init__(self, amzn, asin, data):
@@ -39,29 +40,50 @@ class Station:
         self.cover_url = data['queue']['queueMetadata']['imageUrlMap']['FULL']
         self.name = data['queue']['queueMetadata']['title']
         self._page_token = data['queue']['pageToken']
+        self._tracks = list(data['trackMetadataList'])
+
+    def session(self):
+        """
+        Return the state of this station as a JSON-serialisable `dict`: the ASIN,
+        the page token and the tracks which have been fetched but not yet played.
+        This can be passed to `AmazonMusic.resume_station` (for example, by
+        another process) to continue the station without creating a new queue.
+        """
+        return {
+            'asin': self.id,
+            'name': self.name,
+            'coverUrl': self.cover_url,
+            'pageToken': self._page_token,
+            'trackMetadataList': list(self._tracks)
+        }
 
     def tracks(self):
         """
         Provides an iterable generator for the `Tracks` that make up this station.
         """
-        tracks = []
-        tracks.extend(self.json['trackMetadataList'])
-        while tracks:
-            yield Track(self._amzn, tracks.pop(0))
-
+        tracks = self._tracks
+        while True:
+            # Fetch more once the buffer is empty (including a resumed session
+            # which was saved with nothing buffered)
             if not tracks:
-                data = self._amzn.call(
-                    'mpqs/voiceenabled/getNextTracks',
-                    'com.amazon.musicplayqueueservice.model.client.external.voiceenabled.MusicPlayQueueService'
-                    'ExternalVoiceEnabledClient.getNextTracks', {
-                        'pageToken': self._page_token,
-                        'numberOfTracks': 10,
-                        'customerInfo': {
-                            'deviceId': self._amzn.device_id,
-                            'deviceType': self._amzn.device_type,
-                            'musicTerritory': self._amzn.territory,
-                            'customerId': self._amzn.customer_id
-                        }
-                    })
+                with self._amzn.tracer.span('Station.tracks', asin=self.id):
+                    data = self._amzn.call(
+                        'mpqs/voiceenabled/getNextTracks',
+                        'com.amazon.musicplayqueueservice.model.client.external.voiceenabled.MusicPlayQueueService'
+                        'ExternalVoiceEnabledClient.getNextTracks', {
+                            'pageToken': self._page_token,
+                            'numberOfTracks': 10,
+                            'customerInfo': {
+                                'deviceId': self._amzn.device_id,
+                                'deviceType': self._amzn.device_type,
+                                'musicTerritory': self._amzn.territory,
+                                'customerId': self._amzn.customer_id
+                            }
+                        })
                 self._page_token = data['nextPageToken']
                 tracks.extend(data['trackMetadataList'])
+
+                if not tracks:
+                    return
+
+            yield self._amzn._canonical(Track, tracks.pop(0))
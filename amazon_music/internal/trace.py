@@ -0,0 +1,172 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import itertools
+import json
+import os
+import threading
+import time
+
+
+class Span:
+    """
+    A single timed operation. Spans started while another is open on the same
+    thread are its children.
+
+    Key properties are:
+
+    * `id` - Identifier of the span, unique within its `Tracer`.
+    * `name` - Name of the operation, e.g. `AmazonMusic.call`.
+    * `args` - Details of the operation, e.g. the endpoint being called.
+    * `parent` - Enclosing `Span`, or `None`.
+    * `start`, `end` - `time.perf_counter()` values.
+    * `error` - Description of the exception which ended the span, if any.
+    """
+
+    def __init__(self, id, name, args, parent):
+        self.id = id
+        self.name = name
+        self.args = args
+        self.parent = parent
+        self.thread = threading.get_ident()
+        self.start = time.perf_counter()
+        self.end = None
+        self.error = None
+
+    @property
+    def duration(self):
+        """
+        Duration of the span in seconds, or `None` if it is still open.
+        """
+        return None if self.end is None else self.end - self.start
+
+
+class Tracer:
+    """
+    Records nested spans around the library's operations. Pass one to
+    `AmazonMusic(tracer=...)`, and export the timeline with `export_chrome`
+    (viewable in `chrome://tracing` or Perfetto).
+
+    Hooks allow spans to be forwarded to another tracing system: each hook may
+    define `on_start(span)` and/or `on_end(span)`, which are called on the thread
+    running the operation.
+    """
+
+    def __init__(self, hooks=None, record=True):
+        """
+        :param hooks: (optional) Objects notified as each span starts and ends.
+        :param record: (optional) Keep finished spans for `to_chrome`. Disable if only hooks are used.
+        """
+        self.hooks = list(hooks or [])
+        self.record = record
+        self.spans = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def current(self):
+        """
+        Return the innermost open span on this thread, or `None`.
+        """
+        stack = getattr(self._local, 'stack', None)
+        return stack[-1] if stack else None
+
+    @contextlib.contextmanager
+    def span(self, name, **args):
+        """
+        Time the enclosed block as a span, nested within the current one.
+
+        :param name: Name of the operation.
+        :param args: Details to record with the span.
+        """
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        span = Span(next(self._ids), name, args, stack[-1] if stack else None)
+        stack.append(span)
+        for hook in self.hooks:
+            if hasattr(hook, 'on_start'):
+                hook.on_start(span)
+
+        try:
+            yield span
+        except BaseException as e:
+            span.error = '{}: {}'.format(type(e).__name__, e)
+            raise
+        finally:
+            span.end = time.perf_counter()
+            stack.pop()
+            if self.record:
+                with self._lock:
+                    self.spans.append(span)
+            for hook in self.hooks:
+                if hasattr(hook, 'on_end'):
+                    hook.on_end(span)
+
+    def to_chrome(self):
+        """
+        Return the recorded spans as a Chrome trace-event format `dict`.
+        """
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+
+        events = []
+        for span in sorted(spans, key=lambda s: s.start):
+            args = dict(span.args, id=span.id)
+            if span.parent is not None:
+                args['parent'] = span.parent.id
+            if span.error is not None:
+                args['error'] = span.error
+
+            events.append({
+                'name': span.name,
+                'cat': 'amazon_music',
+                'ph': 'X',
+                'ts': span.start * 1e6,
+                'dur': span.duration * 1e6,
+                'pid': pid,
+                'tid': span.thread,
+                'args': args
+            })
+
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome(self, path):
+        """
+        Write the recorded spans to `path` in Chrome trace-event JSON format.
+
+        :param path: File path to write to.
+        """
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome(), f, default=str)
+
+    def clear(self):
+        """
+        Discard the recorded spans.
+        """
+        with self._lock:
+            self.spans = []
+
+
+class NullTracer:
+    """
+    Tracer used when tracing is not enabled: spans cost nothing and are not recorded.
+    """
+
+    def current(self):
+        return None
+
+    def span(self, name, **args):
+        return contextlib.nullcontext()
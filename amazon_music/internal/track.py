@@ -11,6 +11,12 @@
 # limitations under the License.
 
 import json
+import threading
+
+try:
+    from urllib.parse import urljoin
+except ImportError:
+    from urlparse import urljoin
 
 
 class Track:
@@ -26,6 +32,7 @@ class Track:
     * `albumArtist` - Primary artist for the album
     * `coverUrl` - URL containing cover art for the track/album.
     * `streamUrl` - URL of M3U playlist allowing the track to be streamed.
+    * `segments` - Iterable generator for the URLs of the track's segments, adapting the bitrate.
     """
 
     def __init__(self, amzn, data):
@@ -36,9 +43,27 @@ class Track:
         :param data: JSON data structure for the track, from Amazon Music.
                      Supported data structures are from `mpqs` and `muse`.
         """
+        self._amzn = amzn
+        self._urls = {}
+        self._url_lock = threading.Lock()
+        self.json = {}
+        self._merge(data)
+
+    @staticmethod
+    def _key(data):
+        """
+        Return the identifier of the track described by `data` (see `AmazonMusic.identities`).
+        """
+        if 'identifierType' in data:
+            return data['identifierType'], data.get('identifier')
+        return 'ASIN', data.get('asin')
+
+    def _merge(self, data):
+        """
+        Update the track from `data`, merging it into the data already known.
+        """
         try:
-            self._amzn = amzn
-            self._url = None
+            data = dict(self.json, **data)
 
             self.json = data
             self.name = data.get('name') or data['title']
@@ -70,44 +95,93 @@ class Track:
                 e.args[0], json.dumps(data, sort_keys=True)),)
             raise
 
-    def url(self):
+    def url(self, bitrate=None):
         """
         Return the URL for an M3U playlist for the track, allowing it to be streamed.
         The playlist seems to consist of individual chunks of the song, in ~10s segments,
         so a player capable of playing playlists seamless is required, such as VLC.
+
+        :param bitrate: (optional) `LOW`, `MEDIUM` or `HIGH`. By default, the tier chosen by
+                        `AmazonMusic.bitrate` from the throughput measured so far.
+        """
+        if bitrate is None:
+            bitrate = self._amzn.bitrate.select()
+
+        # Only one thread resolves the URL; others (e.g. a prefetch) wait for its result
+        with self._url_lock:
+            if bitrate not in self._urls:
+                with self._amzn.tracer.span('Track.url', identifier=self.identifier, bitrate=bitrate):
+                    stream_json = self._amzn.call(
+                        'dmls/',
+                        'com.amazon.digitalmusiclocator.DigitalMusicLocatorServiceExternal.getRestrictedStreamingURL',
+                        {
+                            'customerId': self._amzn.customer_id,
+                            'deviceToken': {
+                                'deviceTypeId': self._amzn.device_type,
+                                'deviceId': self._amzn.device_id,
+                            },
+                            'appMetadata': {
+                                'https': 'true'
+                            },
+                            'clientMetadata': {
+                                'clientId': 'WebCP',
+                            },
+                            'contentId': {
+                                'identifier': self.identifier,
+                                'identifierType': self.identifier_type,
+                                'bitRate': bitrate,
+                                'contentDuration': self.duration
+                            }
+                        })
+
+                    if 'statusCode' in stream_json and stream_json['statusCode'] == 'MAX_CONCURRENCY_REACHED':
+                        raise Exception(stream_json['statusCode'])
+
+                    try:
+                        self._urls[bitrate] = stream_json['contentResponse']['urlList'][0]
+                    except KeyError as e:
+                        e.args = ('{} not found in {}'.format(
+                            e.args[0], json.dumps(stream_json, sort_keys=True)),)
+                        raise
+
+        return self._urls[bitrate]
+
+    def segments(self):
+        """
+        Provides an iterable generator for the segments of the track, as
+        `(url, duration, bitrate)` tuples. The bitrate tier is chosen again by
+        `AmazonMusic.bitrate` before each segment, switching to that tier's
+        playlist at the same position when it changes. The segments are not
+        downloaded here: the player must report each one it downloads with
+        `AmazonMusic.bitrate.record` (and the audio it plays with `played`), or the
+        tier never changes.
+        """
+        playlists = {}
+        index = 0
+        while True:
+            bitrate = self._amzn.bitrate.select()
+            if bitrate not in playlists:
+                playlists[bitrate] = self._playlist(self.url(bitrate))
+
+            segments = playlists[bitrate]
+            if index >= len(segments):
+                return
+
+            url, duration = segments[index]
+            yield url, duration, bitrate
+            index += 1
+
+    def _playlist(self, url):
+        """
+        Fetch an M3U playlist, returning `(url, duration)` for each of its segments.
         """
-        if self._url is None:
-            stream_json = self._amzn.call(
-                'dmls/',
-                'com.amazon.digitalmusiclocator.DigitalMusicLocatorServiceExternal.getRestrictedStreamingURL',
-                {
-                    'customerId': self._amzn.customer_id,
-                    'deviceToken': {
-                        'deviceTypeId': self._amzn.device_type,
-                        'deviceId': self._amzn.device_id,
-                    },
-                    'appMetadata': {
-                        'https': 'true'
-                    },
-                    'clientMetadata': {
-                        'clientId': 'WebCP',
-                    },
-                    'contentId': {
-                        'identifier': self.identifier,
-                        'identifierType': self.identifier_type,
-                        'bitRate': 'HIGH',
-                        'contentDuration': self.duration
-                    }
-                })
-
-            if 'statusCode' in stream_json and stream_json['statusCode'] == 'MAX_CONCURRENCY_REACHED':
-                raise Exception(stream_json['statusCode'])
-
-            try:
-                self._url = stream_json['contentResponse']['urlList'][0]
-            except KeyError as e:
-                e.args = ('{} not found in {}'.format(
-                    e.args[0], json.dumps(stream_json, sort_keys=True)),)
-                raise
-
-        return self._url
+        segments = []
+        duration = None
+        for line in self._amzn.session.get(url).text.splitlines():
+            line = line.strip()
+            if line.startswith('#EXTINF:'):
+                duration = float(line[len('#EXTINF:'):].split(',')[0])
+            elif line and not line.startswith('#'):
+                segments.append((urljoin(url, line), duration))
+                duration = None
+        return segments
@@ -0,0 +1,71 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import concurrent.futures
+
+from .track import Track
+
+# Number of tracks looked up per request when streaming a tracklist
+CHUNK_SIZE = 50
+
+# Number of tracks at the start of a tracklist whose stream URLs are resolved in
+# the background; kept small so as not to hit Amazon's stream concurrency limit
+PREFETCH = 2
+
+
+def is_summary(data):
+    """
+    Whether a tracklist entry is only a summary (as returned without `expandTracklist`),
+    which must be looked up before a `Track` can be made from it.
+
+    :param data: Tracklist entry.
+    """
+    return 'artist' not in data and 'artistName' not in data
+
+
+def stream_tracks(amzn, entries, chunk_size=CHUNK_SIZE, prefetch=PREFETCH):
+    """
+    Yield a `Track` for each tracklist entry, looking up summaries `chunk_size`
+    at a time as they are reached. The stream URLs of the first `prefetch`
+    tracks start resolving in the background straight away, so the first track
+    is ready to play as soon as possible. Tracks are yielded without waiting for
+    this: `Track.url` shares a request still in progress, and raises (or retries)
+    if the prefetch failed. Raises `KeyError` if a summary's track can't be
+    found, rather than skipping it.
+
+    :param amzn: AmazonMusic object, used to make API calls.
+    :param entries: Tracklist entries, full or summaries.
+    :param chunk_size: (optional) Number of tracks looked up per request.
+    :param prefetch: (optional) Number of stream URLs to resolve in the background, or `0` for none.
+    """
+    executor = None
+    futures = []
+    try:
+        for start in range(0, len(entries), chunk_size):
+            chunk = entries[start:start + chunk_size]
+
+            summaries = [e['asin'] for e in chunk if is_summary(e)]
+            found = {t.identifier: t for t in amzn.tracks(summaries)} if summaries else {}
+            tracks = [found[e['asin']] if is_summary(e) else amzn._canonical(Track, e) for e in chunk]
+
+            if prefetch and start == 0 and tracks:
+                executor = concurrent.futures.ThreadPoolExecutor(max_workers=prefetch)
+                futures = [executor.submit(t.url) for t in tracks[:prefetch]]
+
+            for t in tracks:
+                yield t
+    finally:
+        # If the caller stops early, don't leave URLs resolving behind it
+        for future in futures:
+            future.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False)
@@ -0,0 +1,34 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Benchmark decoding of a recorded Amazon Music response with each available
+# JSON backend, e.g.:
+#
+#   PYTHONPATH=. python examples/json_benchmark.py lookup.json
+
+import sys
+import timeit
+
+from amazon_music.internal import codec
+
+if len(sys.argv) <= 1:
+    raise Exception("recorded response was not provided (e.g.: lookup.json)")
+
+with open(sys.argv[1], 'rb') as f:
+    payload = f.read()
+
+print("{} ({:.1f} KiB)".format(sys.argv[1], len(payload) / 1024))
+
+for backend in codec.available_backends():
+    c = codec.Codec(backend)
+    number, total = timeit.Timer(lambda: c.loads(payload)).autorange()
+    print("{:>8}: {:8.3f} ms/decode".format(backend, total / number * 1000))